@@ -0,0 +1,237 @@
+from collections import Counter, defaultdict
+
+from django.db import IntegrityError, connection, transaction
+from django.db.models import CharField, F, Value
+from django.db.models.functions import Cast, Concat
+
+from rest_framework import serializers
+from rest_framework.validators import UniqueValidator
+
+from .models import Employee, Department
+from .serializers import EmployeeSerializer
+
+# Fields a bulk update may change ('department_id' is the same write name EmployeeSerializer uses)
+BULK_UPDATE_FIELDS = (
+    'employee_code', 'first_name', 'last_name', 'email', 'phone', 'department_id',
+    'role', 'position', 'date_of_joining', 'salary', 'is_admin', 'status', 'address',
+)
+# Keep in step with DATA_UPLOAD_MAX_MEMORY_SIZE in settings.py (~500 bytes per full row)
+BULK_UPDATE_MAX_ROWS = 50000
+# Rows per lookup query and per UPDATE statement
+BULK_UPDATE_CHUNK_SIZE = 1000
+UNIQUE_FIELDS = ('email', 'employee_code')
+# Placeholder prefix for unique values vacated before being reassigned in the same batch
+VACATED_PREFIX = '~moving~'
+
+
+def chunked(items, size=BULK_UPDATE_CHUNK_SIZE):
+    items = list(items)
+    for start in range(0, len(items), size):
+        yield items[start:start + size]
+
+
+def bulk_fields():
+    """
+    Validation fields for one batch, taken from EmployeeSerializer so both write paths
+    enforce the same rules. Checks that need a query per row are left to the batch:
+    uniqueness validators are dropped and department_id is only range-checked here.
+    """
+    serializer_fields = EmployeeSerializer().fields
+    fields = {}
+    for name in BULK_UPDATE_FIELDS:
+        if name == 'department_id':
+            continue
+        field = serializer_fields[name]
+        field.validators = [v for v in field.validators if not isinstance(v, UniqueValidator)]
+        fields[name] = field
+    fields['department_id'] = integer_field(Department._meta.pk, allow_null=True)
+    fields['id'] = integer_field(Employee._meta.pk)
+    fields['version'] = integer_field(Employee._meta.get_field('version'))
+    return fields
+
+
+def integer_field(model_field, **kwargs):
+    """An IntegerField limited to what the database column can store."""
+    min_value, max_value = connection.ops.integer_field_range(model_field.get_internal_type())
+    return serializers.IntegerField(min_value=min_value, max_value=max_value, **kwargs)
+
+
+def clean_row(row, fields):
+    """Validate one change without touching the database. Returns (changes, errors)."""
+    if not isinstance(row, dict):
+        return None, {'non_field_errors': ['Expected an object.']}
+
+    errors = {}
+    for key in ('id', 'version'):
+        value = row.get(key)
+        if isinstance(value, bool) or not isinstance(value, int):
+            errors[key] = ['A valid integer is required.']
+            continue
+        try:
+            fields[key].run_validation(value)
+        except serializers.ValidationError as exc:
+            errors[key] = exc.detail
+
+    changes = {}
+    for name, value in row.items():
+        if name in ('id', 'version'):
+            continue
+        if name not in BULK_UPDATE_FIELDS:
+            errors[name] = ['This field cannot be bulk updated.']
+            continue
+        try:
+            changes[name] = fields[name].run_validation(value)
+        except serializers.ValidationError as exc:
+            errors[name] = exc.detail
+
+    if not changes and not errors:
+        errors['non_field_errors'] = ['No fields to update.']
+    return changes, errors
+
+
+def bulk_update_employees(queryset, rows):
+    """
+    Apply many employee changes in one transaction.
+
+    Each row is {"id": ..., "version": ..., <field>: <value>, ...}. Validation runs
+    over the whole batch with a fixed number of queries per chunk, and any invalid
+    row rejects the batch. Rows whose version no longer matches the database are
+    skipped and reported as conflicts; every other row is written and its version
+    bumped, in chunks of BULK_UPDATE_CHUNK_SIZE. Rows may swap emails or employee
+    codes with each other.
+    """
+    errors = {}
+    cleaned = {}
+    fields = bulk_fields()
+    for index, row in enumerate(rows):
+        changes, row_errors = clean_row(row, fields)
+        if row_errors:
+            errors[index] = row_errors
+        else:
+            cleaned[index] = changes
+
+    ids = Counter(rows[index]['id'] for index in cleaned)
+    for index in cleaned:
+        if ids[rows[index]['id']] > 1:
+            errors.setdefault(index, {})['id'] = ['Duplicate id in this batch.']
+
+    for field in UNIQUE_FIELDS:
+        values = Counter(changes[field] for changes in cleaned.values() if field in changes)
+        for index, changes in cleaned.items():
+            if field in changes and values[changes[field]] > 1:
+                errors.setdefault(index, {})[field] = [f'Duplicate {field} in this batch.']
+
+    if errors:
+        return {'errors': format_errors(rows, errors)}
+
+    try:
+        with transaction.atomic():
+            return apply_changes(queryset, rows, cleaned)
+    except IntegrityError:
+        # The uniqueness pre-check is not locked, so a concurrent write can still collide
+        return {'error': 'Another change to these employees was saved at the same time, reload and try again'}
+
+
+def apply_changes(queryset, rows, cleaned):
+    """Check cleaned rows against the database and write them. Must run inside a transaction."""
+    errors = {}
+    employees = {}
+    for chunk in chunked(rows[index]['id'] for index in cleaned):
+        employees.update((e.pk, e) for e in queryset.filter(pk__in=chunk).select_for_update())
+
+    department_ids = {c['department_id'] for c in cleaned.values() if c.get('department_id') is not None}
+    existing_departments = set()
+    for chunk in chunked(department_ids):
+        existing_departments.update(Department.objects.filter(pk__in=chunk).values_list('pk', flat=True))
+
+    owners = {}
+    for field in UNIQUE_FIELDS:
+        values = {c[field] for c in cleaned.values() if field in c}
+        owners[field] = {}
+        for chunk in chunked(values):
+            lookup = {f'{field}__in': chunk}
+            owners[field].update(Employee.objects.filter(**lookup).values_list(field, 'pk'))
+
+    # Rows that will be written, by pk; stale rows are skipped and reported as conflicts
+    applied = {
+        rows[index]['id']: changes for index, changes in cleaned.items()
+        if rows[index]['id'] in employees and employees[rows[index]['id']].version == rows[index]['version']
+    }
+
+    for index, changes in cleaned.items():
+        pk = rows[index]['id']
+        if pk not in employees:
+            errors.setdefault(index, {})['id'] = ['Employee not found.']
+        department_id = changes.get('department_id')
+        if department_id is not None and department_id not in existing_departments:
+            errors.setdefault(index, {})['department_id'] = [f'Invalid pk "{department_id}" - object does not exist.']
+        for field in UNIQUE_FIELDS:
+            owner = owners[field].get(changes.get(field), pk)
+            # A value may be taken over from a row this batch moves to another value (swaps)
+            if field in changes and owner != pk and field not in applied.get(owner, ()):
+                errors.setdefault(index, {})[field] = [f'Employee with this {field} already exists.']
+
+    if errors:
+        return {'errors': format_errors(rows, errors)}
+
+    conflicts = []
+    groups = defaultdict(list)
+    for index, changes in cleaned.items():
+        employee = employees[rows[index]['id']]
+        if employee.pk not in applied:
+            conflicts.append({
+                'index': index,
+                'id': employee.pk,
+                'version': rows[index]['version'],
+                'current_version': employee.version,
+            })
+            continue
+        groups[tuple(sorted(changes.items()))].append(employee)
+
+    # Unique columns are checked row by row, so values handed to another row in this
+    # batch are first replaced with a per-row placeholder.
+    for field in UNIQUE_FIELDS:
+        claimed = {changes[field] for changes in applied.values() if field in changes}
+        vacated = [
+            pk for pk, changes in applied.items()
+            if field in changes and changes[field] != getattr(employees[pk], field)
+            and getattr(employees[pk], field) in claimed
+        ]
+        placeholder = Concat(Value(VACATED_PREFIX), Cast('pk', CharField()), output_field=CharField())
+        for chunk in chunked(vacated):
+            Employee.objects.filter(pk__in=chunk).update(**{field: placeholder})
+
+    # Rows sharing the same changes (status or department moves) become one plain
+    # UPDATE per chunk; bulk_update's CASE expressions are only built for the rest.
+    updated = 0
+    singles = []
+    fields = set()
+    for key, members in groups.items():
+        changes = dict(key)
+        updated += len(members)
+        if len(members) == 1:
+            employee = members[0]
+            for name, value in changes.items():
+                setattr(employee, name, value)
+            employee.version += 1
+            fields.update(changes)
+            singles.append(employee)
+            continue
+        for chunk in chunked(employee.pk for employee in members):
+            Employee.objects.filter(pk__in=chunk).update(version=F('version') + 1, **changes)
+
+    if singles:
+        Employee.objects.bulk_update(
+            singles,
+            ['department' if name == 'department_id' else name for name in fields] + ['version'],
+            batch_size=BULK_UPDATE_CHUNK_SIZE,
+        )
+
+    return {'updated': updated, 'conflicts': conflicts}
+
+
+def format_errors(rows, errors):
+    return [
+        {'index': index, 'id': rows[index].get('id') if isinstance(rows[index], dict) else None, 'errors': row_errors}
+        for index, row_errors in sorted(errors.items())
+    ]
@@ -0,0 +1,104 @@
+import json
+import os
+import statistics
+import subprocess
+import sys
+from collections import defaultdict
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+
+# Runs in a fresh interpreter so every phase is measured cold.
+# Prints one JSON object with the duration of each phase in seconds.
+PROFILE_SCRIPT = """
+import json, sys, time
+phases = {}
+start = time.perf_counter()
+mark = start
+
+def done(name):
+    global mark
+    now = time.perf_counter()
+    phases[name] = now - mark
+    mark = now
+
+from django.conf import settings
+settings.INSTALLED_APPS
+done('settings')
+
+import django
+django.setup()
+done('apps_ready')
+
+from django.core.wsgi import get_wsgi_application
+get_wsgi_application()
+done('wsgi_handler')
+
+from backend.warmup import warm_url_resolver, warm_db_connections
+warm_url_resolver()
+done('url_resolver')
+
+if sys.argv[1] == 'db':
+    warm_db_connections()
+    done('db_connection')
+
+phases['total'] = time.perf_counter() - start
+print(json.dumps(phases))
+"""
+
+
+def run_cold_start(with_db=True, import_time=False):
+    """Start a fresh interpreter, returning (phases, importtime stderr)."""
+    cmd = [sys.executable]
+    if import_time:
+        cmd += ['-X', 'importtime']
+    cmd += ['-c', PROFILE_SCRIPT, 'db' if with_db else 'nodb']
+
+    env = os.environ.copy()
+    env['DJANGO_SETTINGS_MODULE'] = settings.SETTINGS_MODULE
+    result = subprocess.run(
+        cmd, cwd=settings.BASE_DIR, env=env, capture_output=True, text=True
+    )
+    if result.returncode != 0:
+        raise CommandError(f"Startup profile failed:\n{result.stderr}")
+    return json.loads(result.stdout.strip().splitlines()[-1]), result.stderr
+
+
+def summarize_import_time(stderr, top=15):
+    """Total the self time of every module per top-level package (seconds)."""
+    totals = defaultdict(int)
+    for line in stderr.splitlines():
+        if not line.startswith('import time:') or 'self [us]' in line:
+            continue
+        self_us, _cumulative, name = line[len('import time:'):].split('|')
+        totals[name.strip().split('.')[0]] += int(self_us)
+    ranked = sorted(totals.items(), key=lambda item: item[1], reverse=True)
+    return [(name, us / 1_000_000) for name, us in ranked[:top]]
+
+
+class Command(BaseCommand):
+    help = "Measure cold start: import time per package and time to each startup phase."
+    requires_system_checks = []
+
+    def add_arguments(self, parser):
+        parser.add_argument('--runs', type=int, default=3, help="Cold starts to run; the median is reported.")
+        parser.add_argument('--top', type=int, default=15, help="Number of packages in the import breakdown.")
+        parser.add_argument('--no-db', action='store_true', help="Skip opening the database connection.")
+        parser.add_argument('--json', action='store_true', help="Print the phase medians as JSON only.")
+
+    def handle(self, *args, **options):
+        runs = [run_cold_start(with_db=not options['no_db'])[0] for _ in range(max(options['runs'], 1))]
+        phases = {name: statistics.median(run[name] for run in runs) for name in runs[0]}
+
+        if options['json']:
+            self.stdout.write(json.dumps(phases))
+            return
+
+        self.stdout.write(f"Startup phases (median of {len(runs)} cold starts):")
+        for name, seconds in phases.items():
+            self.stdout.write(f"  {name:<16}{seconds * 1000:9.1f} ms")
+
+        _, stderr = run_cold_start(with_db=False, import_time=True)
+        self.stdout.write(f"\nImport time by package (top {options['top']}, self time):")
+        for name, seconds in summarize_import_time(stderr, options['top']):
+            self.stdout.write(f"  {name:<28}{seconds * 1000:9.1f} ms")
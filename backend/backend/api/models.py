@@ -1,7 +1,11 @@
 
-from django.db import models
+from django.db import models, transaction
+from django.db.models import F
 from django.contrib.auth.models import User
 
+class VersionConflict(Exception):
+    """Raised when an Employee row changed since the copy being saved was loaded."""
+
 class Department(models.Model):
     name = models.CharField(max_length=100)
     description = models.TextField(blank=True, null=True)
@@ -26,10 +30,35 @@ class Employee(models.Model):
     is_admin = models.BooleanField(default=False)
     status = models.CharField(max_length=20, default='active')
     address = models.TextField(blank=True, null=True)
+    # Row version for optimistic concurrency (see api/bulk.py)
+    version = models.PositiveIntegerField(default=1)
 
     def __str__(self):
         return f"{self.first_name} {self.last_name}"
 
+    def save(self, *args, **kwargs):
+        update_fields = kwargs.get('update_fields')
+        if self._state.adding or kwargs.get('force_insert') or (update_fields is not None and not update_fields):
+            return super().save(*args, **kwargs)
+
+        # Optimistic concurrency: claim the next version only if the row still has
+        # the version this copy was loaded with, then write the rest of the fields.
+        if update_fields is not None:
+            kwargs['update_fields'] = {*update_fields, 'version'}
+        using = kwargs.get('using') or self._state.db
+        with transaction.atomic(using=using):
+            claimed = Employee.objects.using(using).filter(
+                pk=self.pk, version=self.version
+            ).update(version=F('version') + 1)
+            if not claimed:
+                raise VersionConflict(f"Employee {self.pk} was changed since version {self.version} was loaded.")
+            self.version += 1
+            try:
+                super().save(*args, **kwargs)
+            except Exception:
+                self.version -= 1
+                raise
+
 class Attendance(models.Model):
     employee = models.ForeignKey(Employee, on_delete=models.CASCADE)
     date = models.DateField()
@@ -20,7 +20,7 @@ class EmployeeSerializer(serializers.ModelSerializer):
         model = Employee
         fields = '__all__'
         # Fix: Tell Django not to complain about missing department object
-        extra_kwargs = {'department': {'read_only': True}}
+        extra_kwargs = {'department': {'read_only': True}, 'version': {'read_only': True}}
 
     def create(self, validated_data):
         password = validated_data.pop('password', None)
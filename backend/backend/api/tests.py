@@ -1,3 +1,395 @@
-from django.test import TestCase
+import json
+import os
+from io import StringIO
+from unittest import mock
 
-# Create your tests here.
+from django.conf import settings
+from django.contrib.auth.models import User
+from django.core.management import call_command
+from django.db import IntegrityError, OperationalError, connection, connections
+from django.test import RequestFactory, SimpleTestCase, TestCase, tag
+from django.test.utils import CaptureQueriesContext
+from rest_framework.test import APIClient
+
+from backend.warmup import warm_db_connections
+
+from .management.commands import startup_profile
+from .management.commands.startup_profile import summarize_import_time
+from .bulk import BULK_UPDATE_FIELDS, BULK_UPDATE_MAX_ROWS
+from .models import Department, Employee, VersionConflict
+
+# Cold start budget in seconds; loose so shared CI machines do not flake.
+# Override with STARTUP_BUDGET_SECONDS, or skip with: manage.py test --exclude-tag startup
+STARTUP_BUDGET_SECONDS = float(os.environ.get('STARTUP_BUDGET_SECONDS', '5.0'))
+
+IMPORT_TIME_STDERR = """\
+import time: self [us] | cumulative | imported package
+import time:       300 |        300 |     django.utils.version
+import time:       200 |        500 |   django.utils
+import time:      1000 |       1500 | django
+import time:       700 |        700 | rest_framework
+import time:       100 |        100 | api.models
+"""
+
+
+@tag('startup')
+class StartupTimeTests(SimpleTestCase):
+    def test_cold_start_within_budget(self):
+        out = StringIO()
+        call_command('startup_profile', '--json', '--no-db', '--runs', '1', stdout=out)
+        phases = json.loads(out.getvalue())
+
+        self.assertEqual(
+            list(phases), ['settings', 'apps_ready', 'wsgi_handler', 'url_resolver', 'total']
+        )
+        self.assertLess(
+            phases['total'], STARTUP_BUDGET_SECONDS,
+            f"Cold start took {phases['total']:.2f}s, budget is {STARTUP_BUDGET_SECONDS}s: {phases}",
+        )
+
+
+class StartupProfileOutputTests(SimpleTestCase):
+    def test_summarize_import_time_totals_self_time_per_package(self):
+        self.assertEqual(summarize_import_time(IMPORT_TIME_STDERR), [
+            ('django', 0.0015), ('rest_framework', 0.0007), ('api', 0.0001),
+        ])
+        self.assertEqual(summarize_import_time(IMPORT_TIME_STDERR, top=1), [('django', 0.0015)])
+
+    def test_text_report(self):
+        phases = {'settings': 0.01, 'apps_ready': 0.2, 'wsgi_handler': 0.02,
+                  'url_resolver': 0.05, 'db_connection': 0.003, 'total': 0.283}
+        with mock.patch.object(startup_profile, 'run_cold_start', return_value=(phases, IMPORT_TIME_STDERR)) as run:
+            out = StringIO()
+            call_command('startup_profile', '--runs', '2', '--top', '2', stdout=out)
+
+        self.assertEqual(run.call_args_list, [
+            mock.call(with_db=True), mock.call(with_db=True), mock.call(with_db=False, import_time=True),
+        ])
+        report = out.getvalue()
+        self.assertIn("Startup phases (median of 2 cold starts):", report)
+        self.assertIn("  db_connection         3.0 ms", report)
+        self.assertIn("  total               283.0 ms", report)
+        self.assertIn("Import time by package (top 2, self time):", report)
+        self.assertIn("  rest_framework                    0.7 ms", report)
+        self.assertNotIn("api  ", report)
+
+
+class WarmupTests(SimpleTestCase):
+    def test_unreachable_database_does_not_fail_warmup(self):
+        with mock.patch.object(connections['default'], 'ensure_connection', side_effect=OperationalError('down')):
+            with self.assertLogs('backend.warmup', 'WARNING'):
+                warm_db_connections()
+
+
+def create_employees(department, count, start=0):
+    return Employee.objects.bulk_create([
+        Employee(
+            employee_code=f'EMP{i:05d}', first_name='Test', last_name=str(i),
+            email=f'emp{i}@example.com', department=department, salary=1000,
+        )
+        for i in range(start, start + count)
+    ])
+
+
+class EmployeeBulkUpdateTests(TestCase):
+    url = '/api/employees/bulk-update/'
+
+    def setUp(self):
+        self.client = APIClient()
+        self.client.force_authenticate(User.objects.create_superuser('admin', 'admin@example.com', 'admin'))
+        self.sales = Department.objects.create(name='Sales')
+        self.support = Department.objects.create(name='Support')
+        self.employees = create_employees(self.sales, 3)
+
+    def test_applies_changes_and_bumps_version(self):
+        first, second, _ = self.employees
+        response = self.client.patch(self.url, {'updates': [
+            {'id': first.id, 'version': 1, 'salary': '1500.00', 'department_id': self.support.id},
+            {'id': second.id, 'version': 1, 'status': 'inactive'},
+        ]}, format='json')
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.data, {'updated': 2, 'conflicts': []})
+        first.refresh_from_db()
+        second.refresh_from_db()
+        self.assertEqual(str(first.salary), '1500.00')
+        self.assertEqual(first.department, self.support)
+        self.assertEqual(first.version, 2)
+        self.assertEqual(second.status, 'inactive')
+        self.assertEqual(second.version, 2)
+
+    def test_shared_changes_are_applied_to_every_row(self):
+        updates = [{'id': e.id, 'version': 1, 'status': 'inactive'} for e in self.employees]
+        response = self.client.patch(self.url, {'updates': updates}, format='json')
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.data['updated'], 3)
+        self.assertEqual(
+            set(Employee.objects.values_list('status', 'version')), {('inactive', 2)}
+        )
+
+    def test_stale_version_is_reported_as_conflict(self):
+        first, second, _ = self.employees
+        first.position = 'Lead'
+        first.save()
+
+        response = self.client.patch(self.url, {'updates': [
+            {'id': first.id, 'version': 1, 'salary': '2000.00'},
+            {'id': second.id, 'version': 1, 'salary': '2000.00'},
+        ]}, format='json')
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.data['updated'], 1)
+        self.assertEqual(response.data['conflicts'], [{'index': 0, 'id': first.id, 'version': 1, 'current_version': 2}])
+        first.refresh_from_db()
+        self.assertEqual(str(first.salary), '1000.00')
+
+    def test_stale_copy_cannot_overwrite_bulk_update(self):
+        first = self.employees[0]
+        stale = Employee.objects.get(pk=first.pk)
+
+        response = self.client.patch(self.url, {'updates': [
+            {'id': first.id, 'version': 1, 'salary': '5000.00'},
+        ]}, format='json')
+        self.assertEqual(response.status_code, 200)
+
+        stale.position = 'Lead'
+        with self.assertRaises(VersionConflict):
+            stale.save()
+        self.assertEqual(stale.version, 1)
+
+        first.refresh_from_db()
+        self.assertEqual(str(first.salary), '5000.00')
+        self.assertIsNone(first.position)
+        self.assertEqual(first.version, 2)
+
+        response = self.client.patch(self.url, {'updates': [
+            {'id': first.id, 'version': 1, 'salary': '1000.00'},
+        ]}, format='json')
+        self.assertEqual(response.data['conflicts'][0]['current_version'], 2)
+
+    def test_save_bumps_version_and_keeps_update_fields_semantics(self):
+        employee = Employee.objects.get(pk=self.employees[0].pk)
+        with self.assertNumQueries(0):
+            employee.save(update_fields=[])
+
+        employee.status = 'inactive'
+        employee.save(update_fields=['status'])
+        employee.refresh_from_db()
+        self.assertEqual((employee.status, employee.version), ('inactive', 2))
+
+    def test_per_row_patch_of_changed_row_returns_conflict(self):
+        employee = self.employees[0]
+        with mock.patch.object(Employee, 'save', side_effect=VersionConflict):
+            response = self.client.patch(f'/api/employees/{employee.id}/', {'salary': '1.00'}, format='json')
+        self.assertEqual(response.status_code, 409)
+
+    def test_invalid_rows_reject_the_whole_batch(self):
+        first, second, third = self.employees
+        response = self.client.patch(self.url, {'updates': [
+            {'id': first.id, 'version': 1, 'salary': '10.00'},
+            {'id': second.id, 'version': 1, 'department_id': 9999},
+            {'id': third.id, 'version': 1, 'email': first.email},
+            {'id': 9999, 'version': 1, 'status': 'inactive'},
+        ]}, format='json')
+
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual([(e['index'], list(e['errors'])) for e in response.data['errors']], [
+            (1, ['department_id']), (2, ['email']), (3, ['id']),
+        ])
+        first.refresh_from_db()
+        self.assertEqual(str(first.salary), '1000.00')
+
+    def test_field_validation_errors(self):
+        first, second, _ = self.employees
+        response = self.client.patch(self.url, {'updates': [
+            {'id': first.id, 'version': 1, 'role': 'ceo', 'email': 'not-an-email'},
+            {'id': second.id, 'version': 1, 'user': 1},
+            {'id': 'x', 'version': 1, 'status': 'inactive'},
+        ]}, format='json')
+
+        self.assertEqual(response.status_code, 400)
+        errors = {e['index']: e['errors'] for e in response.data['errors']}
+        self.assertEqual(set(errors[0]), {'role', 'email'})
+        self.assertEqual(errors[1], {'user': ['This field cannot be bulk updated.']})
+        self.assertEqual(errors[2], {'id': ['A valid integer is required.']})
+
+    def test_non_string_values_are_rejected_like_per_row_patch(self):
+        first, second, third = self.employees
+        response = self.client.patch(self.url, {'updates': [
+            {'id': first.id, 'version': 1, 'date_of_joining': 123},
+            {'id': second.id, 'version': 1, 'date_of_joining': [1]},
+            {'id': third.id, 'version': 1, 'first_name': {'a': 1}, 'email': ['x@example.com'], 'status': ['inactive']},
+        ]}, format='json')
+
+        self.assertEqual(response.status_code, 400)
+        errors = {e['index']: e['errors'] for e in response.data['errors']}
+        self.assertEqual(list(errors[0]), ['date_of_joining'])
+        self.assertEqual(list(errors[1]), ['date_of_joining'])
+        self.assertEqual(set(errors[2]), {'first_name', 'email', 'status'})
+        self.assertEqual(errors[2]['first_name'], ['Not a valid string.'])
+        third.refresh_from_db()
+        self.assertEqual(third.first_name, 'Test')
+
+    def test_out_of_range_integers_are_field_errors(self):
+        first, second, _ = self.employees
+        response = self.client.patch(self.url, {'updates': [
+            {'id': 10 ** 30, 'version': 1, 'status': 'inactive'},
+            {'id': first.id, 'version': 10 ** 30, 'status': 'inactive'},
+            {'id': second.id, 'version': 1, 'department_id': 10 ** 30},
+        ]}, format='json')
+
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual([(e['index'], list(e['errors'])) for e in response.data['errors']], [
+            (0, ['id']), (1, ['version']), (2, ['department_id']),
+        ])
+
+    def test_duplicates_in_batch(self):
+        first, second, third = self.employees
+        response = self.client.patch(self.url, {'updates': [
+            {'id': first.id, 'version': 1, 'employee_code': 'DUP', 'email': 'same@example.com'},
+            {'id': second.id, 'version': 1, 'employee_code': 'DUP', 'email': 'same@example.com'},
+            {'id': third.id, 'version': 1, 'status': 'inactive'},
+            {'id': third.id, 'version': 1, 'position': 'Lead'},
+        ]}, format='json')
+
+        self.assertEqual(response.status_code, 400)
+        errors = {e['index']: e['errors'] for e in response.data['errors']}
+        for index in (0, 1):
+            self.assertEqual(errors[index], {
+                'employee_code': ['Duplicate employee_code in this batch.'],
+                'email': ['Duplicate email in this batch.'],
+            })
+        for index in (2, 3):
+            self.assertEqual(errors[index], {'id': ['Duplicate id in this batch.']})
+
+    def test_rows_can_swap_unique_values(self):
+        first, second, third = self.employees
+        response = self.client.patch(self.url, {'updates': [
+            {'id': first.id, 'version': 1, 'email': second.email, 'employee_code': third.employee_code},
+            {'id': second.id, 'version': 1, 'email': first.email},
+            {'id': third.id, 'version': 1, 'employee_code': first.employee_code},
+        ]}, format='json')
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.data['updated'], 3)
+        for employee in self.employees:
+            employee.refresh_from_db()
+        self.assertEqual((first.email, first.employee_code), ('emp1@example.com', 'EMP00002'))
+        self.assertEqual((second.email, second.employee_code), ('emp0@example.com', 'EMP00001'))
+        self.assertEqual((third.email, third.employee_code), ('emp2@example.com', 'EMP00000'))
+
+    def test_cannot_take_value_from_row_skipped_as_conflict(self):
+        first, second, _ = self.employees
+        response = self.client.patch(self.url, {'updates': [
+            {'id': first.id, 'version': 1, 'email': second.email},
+            {'id': second.id, 'version': 5, 'email': first.email},
+        ]}, format='json')
+
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual(response.data['errors'][0]['errors'], {'email': ['Employee with this email already exists.']})
+
+    def test_integrity_error_during_write_is_a_conflict(self):
+        first, second, _ = self.employees
+        with mock.patch.object(Employee.objects, 'bulk_update', side_effect=IntegrityError):
+            response = self.client.patch(self.url, {'updates': [
+                {'id': first.id, 'version': 1, 'email': 'new1@example.com'},
+                {'id': second.id, 'version': 1, 'email': 'new2@example.com'},
+            ]}, format='json')
+
+        self.assertEqual(response.status_code, 409)
+        first.refresh_from_db()
+        self.assertEqual(first.email, 'emp0@example.com')
+
+    def test_full_batch_fits_in_upload_limit(self):
+        row = {
+            'id': 1234567, 'version': 12, 'employee_code': 'EMP0001234', 'first_name': 'Alexandria',
+            'last_name': 'Montgomery-Smith', 'email': 'alexandria.montgomery-smith@example.com',
+            'phone': '+1 555 0100 1234', 'department_id': 1234, 'role': 'employee',
+            'position': 'Senior Software Engineer', 'date_of_joining': '2024-01-01',
+            'salary': '12345678.00', 'is_admin': False, 'status': 'inactive',
+            'address': '1234 Long Street Name, Apartment 56, Springfield, State 12345, Country',
+        }
+        self.assertEqual(set(row) - {'id', 'version'}, set(BULK_UPDATE_FIELDS))
+        body = json.dumps({'updates': [row] * BULK_UPDATE_MAX_ROWS})
+        self.assertLess(len(body), settings.DATA_UPLOAD_MAX_MEMORY_SIZE)
+
+    def test_batch_larger_than_default_upload_limit_reaches_the_view(self):
+        # ~4 MB, above Django's 2.5 MB default; rows point at missing employees
+        updates = [
+            {'id': 1000000 + i, 'version': 1, 'department_id': self.support.id, 'position': 'Senior Software Engineer'}
+            for i in range(BULK_UPDATE_MAX_ROWS)
+        ]
+        body = json.dumps({'updates': updates})
+        self.assertGreater(len(body), 2621440)
+        # Django enforces the limit wherever request.body is read (middleware, parsers)
+        RequestFactory().patch(self.url, body, content_type='application/json').body
+
+        response = self.client.patch(self.url, body, content_type='application/json')
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual(len(response.data['errors']), BULK_UPDATE_MAX_ROWS)
+        self.assertEqual(response.data['errors'][0]['errors'], {'id': ['Employee not found.']})
+
+    def test_rejects_more_than_max_rows(self):
+        response = self.client.patch(self.url, {'updates': [{}] * (BULK_UPDATE_MAX_ROWS + 1)}, format='json')
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual(response.data, {'error': f'At most {BULK_UPDATE_MAX_ROWS} updates per request'})
+
+    def test_only_admins_can_bulk_update(self):
+        first, second, _ = self.employees
+        user = User.objects.create_user('emp0@example.com', 'emp0@example.com', 'secret')
+        Employee.objects.filter(pk=first.pk).update(user=user)
+        client = APIClient()
+        client.force_authenticate(user)
+        updates = {'updates': [{'id': first.id, 'version': 1, 'is_admin': True, 'salary': '999999.00'}]}
+
+        response = client.patch(self.url, updates, format='json')
+        self.assertEqual(response.status_code, 403)
+        first.refresh_from_db()
+        self.assertEqual((first.is_admin, str(first.salary)), (False, '1000.00'))
+
+        Employee.objects.filter(pk=first.pk).update(is_admin=True)
+        client.force_authenticate(User.objects.get(pk=user.pk))
+        updates = {'updates': [{'id': first.id, 'version': 1, 'salary': '1200.00'}]}
+        response = client.patch(self.url, updates, format='json')
+        self.assertEqual(response.status_code, 200)
+
+    def test_requires_updates_list(self):
+        response = self.client.patch(self.url, {'updates': []}, format='json')
+        self.assertEqual(response.status_code, 400)
+
+
+class EmployeeBulkUpdateQueryBenchmark(TestCase):
+    """Compares query counts of per-row PATCH against one bulk-update request."""
+
+    def setUp(self):
+        self.client = APIClient()
+        self.client.force_authenticate(User.objects.create_superuser('admin', 'admin@example.com', 'admin'))
+        self.department = Department.objects.create(name='Sales')
+
+    def bulk_queries(self, count, start):
+        employees = create_employees(self.department, count, start)
+        updates = [{'id': e.id, 'version': 1, 'salary': '1100.00', 'department_id': self.department.id} for e in employees]
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.patch('/api/employees/bulk-update/', {'updates': updates}, format='json')
+        self.assertEqual(response.data['updated'], count)
+        return len(queries)
+
+    def test_bulk_update_query_count_does_not_grow_per_row(self):
+        small = self.bulk_queries(10, start=0)
+        large = self.bulk_queries(500, start=10)
+        # Only extra UPDATE batches are allowed (SQLite caps parameters per statement)
+        self.assertLess(large, small + 5)
+
+    def test_bulk_update_uses_far_fewer_queries_than_per_row_patch(self):
+        count = 200
+        bulk = self.bulk_queries(count, start=0)
+
+        employees = create_employees(self.department, count, start=count)
+        with CaptureQueriesContext(connection) as queries:
+            for e in employees:
+                self.client.patch(f'/api/employees/{e.id}/', {'salary': '1100.00', 'department_id': self.department.id}, format='json')
+        per_row = len(queries)
+
+        self.assertGreaterEqual(per_row, count * 3)
+        self.assertLess(bulk * 50, per_row)
@@ -1,11 +1,12 @@
 from rest_framework import viewsets, status
-from rest_framework.decorators import api_view, permission_classes
+from rest_framework.decorators import action, api_view, permission_classes
 from rest_framework.permissions import IsAuthenticated, AllowAny
 from rest_framework.response import Response
 from django.contrib.auth import authenticate
 from rest_framework_simplejwt.tokens import RefreshToken
-from .models import Employee, Department, Attendance, Payroll
+from .models import Employee, Department, Attendance, Payroll, VersionConflict
 from .serializers import EmployeeSerializer, DepartmentSerializer, AttendanceSerializer, PayrollSerializer
+from .bulk import bulk_update_employees, BULK_UPDATE_MAX_ROWS
 from django.http import JsonResponse
 from django.contrib.auth.models import User
 
@@ -54,6 +55,32 @@ class EmployeeViewSet(viewsets.ModelViewSet):
             return Employee.objects.all().order_by('-id')
         return Employee.objects.filter(user=user)
 
+    def update(self, request, *args, **kwargs):
+        try:
+            return super().update(request, *args, **kwargs)
+        except VersionConflict:
+            return Response({'error': 'Employee was changed by someone else, reload and try again'}, status=status.HTTP_409_CONFLICT)
+
+    @action(detail=False, methods=['patch'], url_path='bulk-update')
+    def bulk_update(self, request):
+        # Body: {"updates": [{"id": 1, "version": 3, "salary": "55000.00"}, ...]}
+        user = request.user
+        if not (user.is_superuser or (hasattr(user, 'employee') and user.employee.is_admin)):
+            return Response({'error': 'Only admins can bulk update employees'}, status=status.HTTP_403_FORBIDDEN)
+
+        updates = request.data.get('updates') if isinstance(request.data, dict) else None
+        if not isinstance(updates, list) or not updates:
+            return Response({'error': 'Provide a non-empty "updates" list'}, status=status.HTTP_400_BAD_REQUEST)
+        if len(updates) > BULK_UPDATE_MAX_ROWS:
+            return Response({'error': f'At most {BULK_UPDATE_MAX_ROWS} updates per request'}, status=status.HTTP_400_BAD_REQUEST)
+
+        result = bulk_update_employees(self.get_queryset(), updates)
+        if 'error' in result:
+            return Response(result, status=status.HTTP_409_CONFLICT)
+        if 'errors' in result:
+            return Response(result, status=status.HTTP_400_BAD_REQUEST)
+        return Response(result)
+
 class DepartmentViewSet(viewsets.ModelViewSet):
     queryset = Department.objects.all()
     serializer_class = DepartmentSerializer
@@ -124,4 +124,9 @@ REST_FRAMEWORK = {
 from datetime import timedelta
 SIMPLE_JWT = {
     'ACCESS_TOKEN_LIFETIME': timedelta(days=1),
-}
\ No newline at end of file
+}
+
+# --- 10. REQUEST SIZE ---
+# PATCH /api/employees/bulk-update/ accepts up to 50,000 rows (api/bulk.py).
+# A row with every bulk field is ~500 bytes of JSON, so allow ~32 MB request bodies.
+DATA_UPLOAD_MAX_MEMORY_SIZE = 32 * 1024 * 1024
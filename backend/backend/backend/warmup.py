@@ -0,0 +1,40 @@
+"""
+Warmup helpers for the backend project.
+
+gunicorn.conf.py calls these so a freshly started worker does not pay for
+loading the URL patterns or opening a database connection on its first request.
+"""
+
+import logging
+
+from django.db import Error, connections
+from django.urls import get_resolver
+
+logger = logging.getLogger(__name__)
+
+
+def warm_url_resolver():
+    """Import every urlconf and view module and build the reverse lookup tables."""
+    resolver = get_resolver()
+    # Touching reverse_dict walks every included urlconf, which imports the views.
+    resolver.reverse_dict
+    return resolver
+
+
+def warm_db_connections():
+    """
+    Open a connection for every configured database.
+
+    Best effort: a database that is not reachable yet (e.g. still waking up) is
+    logged and left for the first request to connect, instead of failing the worker.
+    """
+    for connection in connections.all():
+        try:
+            connection.ensure_connection()
+        except Error:
+            logger.warning("Could not warm database connection %r", connection.alias, exc_info=True)
+
+
+def close_db_connections():
+    """Close every open connection (sockets must not be shared across a fork)."""
+    connections.close_all()
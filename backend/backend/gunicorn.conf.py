@@ -0,0 +1,30 @@
+"""
+Gunicorn configuration for the backend project.
+
+Gunicorn reads this file automatically when started from this directory:
+
+    gunicorn backend.wsgi
+
+The app is loaded once in the master and the workers are forked from it, so a
+new worker is ready to serve without importing Django again.
+"""
+
+preload_app = True
+
+
+def when_ready(server):
+    # Runs in the master after the app is loaded, before any worker is forked.
+    from backend.warmup import warm_url_resolver
+    warm_url_resolver()
+
+
+def pre_fork(server, worker):
+    # Forked workers must not inherit the master's database sockets.
+    from backend.warmup import close_db_connections
+    close_db_connections()
+
+
+def post_fork(server, worker):
+    # Connect now instead of on the worker's first request.
+    from backend.warmup import warm_db_connections
+    warm_db_connections()